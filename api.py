@@ -1,38 +1,34 @@
-import json
-import sqlite3
+import collections
+import io
+import queue
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from programme_costing_utilities import runtime
+from programme_costing_utilities import calculations, database, runtime
+from programme_costing_utilities.templates import DEFAULTS
 
-with open("./templates/personnel.json", "r", encoding="utf-8") as file:
-    default_personnel = json.load(file)
-with open("./templates/meetings.json", "r", encoding="utf-8") as file:
-    default_meetings = json.load(file)
-with open("./templates/media.json", "r", encoding="utf-8") as file:
-    default_media = json.load(file)
-
-DEFAULTS = {
-    "country": "UGA",
-    "start_year": 2020,
-    "end_year": 2100,
-    "discount_rate": 1.03,
-    "desired_currency": "USD",
-    "desired_year": 2018,
-    "components": {
-        "personnel": default_personnel,
-        "meetings": default_meetings,
-        "media": default_media
-    }
-}
+DATABASE_POOL_SIZE = 4
 
 def load_database():
-    conn = sqlite3.connect('./data/who_choice_price_database.db')
-    return conn
+    return database.connect()
 
 app = FastAPI()
 
+@app.on_event("startup")
+def open_database_pool():
+    app.state.db_pool = queue.Queue()
+    for _ in range(DATABASE_POOL_SIZE):
+        app.state.db_pool.put(load_database())
+
+@app.on_event("shutdown")
+def close_database_pool():
+    while not app.state.db_pool.empty():
+        app.state.db_pool.get().close()
+    # the reference caches are keyed on the connections, release them too
+    calculations.clear_reference_caches()
+
 origins = [
     "https://pc.forecasthealth.org",
     "https://pcapi.forecasthealth.org"
@@ -54,18 +50,19 @@ class Item(BaseModel):
     desired_currency: str
     desired_year: int
 
+def cost_programme(parameters):
+    data = collections.ChainMap(parameters, DEFAULTS)
+    conn = app.state.db_pool.get()
+    try:
+        _, table = runtime.run(data, conn, include_logs=False)
+    finally:
+        app.state.db_pool.put(conn)
+    buffer = io.StringIO()
+    table.to_csv(buffer, index=False)
+    return buffer.getvalue()
+
 @app.post("/process")
 async def process(item: Item):
-    data = {**DEFAULTS, **item.dict()}
-    conn = load_database()
-    logs, table = runtime.run(data, conn)
-    table_filename = "output.csv"
-    table.to_csv(table_filename, index=False, encoding='utf-8')
-    logs_filename = "output_logs.txt"
-    with open(logs_filename, "w") as f:
-        for s in logs:
-            f.write(s + "\n")
-    with open(table_filename, "r") as f:  
-        csv_content = f.read()
+    # the costing is synchronous, keep it off the event loop
+    csv_content = await run_in_threadpool(cost_programme, item.dict())
     return PlainTextResponse(csv_content)
-
@@ -1,28 +1,7 @@
 import argparse
 import json
-import sqlite3
-from programme_costing_utilities import runtime
-
-with open("./templates/personnel.json", "r", encoding="utf-8") as file:
-    default_personnel = json.load(file)
-with open("./templates/meetings.json", "r", encoding="utf-8") as file:
-    default_meetings = json.load(file)
-with open("./templates/media.json", "r", encoding="utf-8") as file:
-    default_media = json.load(file)
-
-DEFAULTS = {
-    "country": "UGA",
-    "start_year": 2020,
-    "end_year": 2100,
-    "discount_rate": 1.03,
-    "desired_currency": "USD",
-    "desired_year": 2018,
-    "components": {
-        "personnel": default_personnel,
-        "meetings": default_meetings,
-        "media": default_media
-    }
-}
+from programme_costing_utilities import database, runtime
+from programme_costing_utilities.templates import DEFAULTS
 
 def get_args():
     parser = argparse.ArgumentParser(description='A utility for producing modular programme costs.')
@@ -36,8 +15,7 @@ def load_input_file(input_file):
     return {**DEFAULTS, **data}
 
 def load_database():
-    conn = sqlite3.connect('./data/who_choice_price_database.db')
-    return conn
+    return database.connect()
 
 def main():
     args = get_args()
@@ -51,8 +29,7 @@ def main():
         table.to_csv(table_filename, index=False, encoding='utf-8')
         logs_filename = args.output + "_logs.txt"
         with open(logs_filename, "w") as f:
-            for s in logs:
-                f.write(s + "\n")
+            f.write("\n".join(logs) + "\n")
     else:
         print(table)
         print('\n'.join(logs))
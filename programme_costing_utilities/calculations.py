@@ -1,10 +1,319 @@
 """
 Provides the methods to calculate the personnel quantity and cost.
 """
+import functools
 import numpy as np
 import json
 import warnings
 
+POPULATION_QUERY = """
+    SELECT Time, Value
+    FROM population
+    WHERE Iso3 = ?
+    AND Variant = ?
+    AND Time BETWEEN ? AND ?
+    """
+
+SALARIES_QUERY = """
+    SELECT ISCO_08_level, annual_salary, currency, year
+    FROM costs_salaries
+    WHERE ISO3 = ?
+    """
+
+DIVISIONS_QUERY = """
+    SELECT *
+    FROM administrative_divisions
+    WHERE ISO3 = ?
+    """
+
+SUPPLY_COSTS_QUERY = """
+    SELECT item, price, currency, year
+    FROM office_supplies_and_furniture
+    """
+
+VEHICLE_COSTS_QUERY = """
+    SELECT vehicle_model, operating_cost_per_km, consumption_litres_per_km, currency, year
+    FROM costs_transport
+    """
+
+ECONOMIC_STATISTICS_QUERY = """
+    SELECT * FROM "economic_statistics"
+    WHERE "Series Name" = ?
+    """
+
+PPP_SERIES = "PPP conversion factor, GDP (LCU per international $)"
+GDP_DEFLATOR_SERIES = "GDP deflator (base year varies by country)"
+GDP_PER_CAPITA_SERIES = "GDP per capita, PPP (current international $)"
+
+# position of the number of divisions in an administrative_divisions row
+DIVISION_COLUMNS = {
+    "provincial": 1,
+    "district": 2
+}
+
+# per diem (daily subsistence allowance) column for each division
+DSA_COLUMNS = {
+    "national": "dsa_national",
+    "provincial": "dsa_upper",
+    "district": "dsa_lower"
+}
+
+PER_DIEM_QUERIES = {
+    division: f"""
+        SELECT {dsa}, currency, year, local_proportion
+        FROM costs_per_diems
+        WHERE ISO3 = ?
+        """
+    for division, dsa in DSA_COLUMNS.items()
+}
+
+# health facility types served at each division
+HEALTH_FACILITY_TYPES = {
+    "national": ["regional_hospitals"],
+    "provincial": ["provincial_hospitals"],
+    "district": ["district_hospitals", "health_centres", "health_posts"]
+}
+
+HEALTHCARE_FACILITIES_QUERY = """
+    SELECT {label}
+    FROM healthcare_facilities
+    WHERE ISO3 = ?
+    """
+
+HEALTHCARE_FACILITIES_COLUMNS = tuple(
+    label
+    for labels in HEALTH_FACILITY_TYPES.values()
+    for label in labels
+)
+
+HEALTHCARE_FACILITIES_BULK_QUERY = HEALTHCARE_FACILITIES_QUERY.format(
+    label=", ".join(HEALTHCARE_FACILITIES_COLUMNS)
+)
+
+# standardized population served by each division
+STANDARD_POPULATIONS = {
+    "national": 50_000_000,
+    "provincial": 5_000_000,
+    "district": 500_000
+}
+
+# personnel roles with extra needs
+NEED_CARS_AND_TRAVEL = ("Transport Driver", )
+CAR_PREFERENCE = "Toyota Hiace passenger van"
+DONT_NEED_OFFICE_SUPPLIES = ("Cleaner", "Transport Driver")
+
+OFFICE_SUPPLIES = (
+    {
+        "item": "Computer   ",
+        "per person": 0.5,
+        "useful life years": 5
+    },
+    {
+        "item": "Multifunciton Photocopier, Fax, Printer and Scanner ",
+        "per person": 0.125,
+        "useful life years": 5
+    }
+)
+
+CADRE_LOOKUP_PATH = "./data/personnel_cadre.json"
+
+DAYS_WORKED_PER_YEAR = 230  # FIXME #1 - Should interrogate this assumption
+
+KM_TRAVELLED_PER_YEAR = 1 * 2000 * 12  # TODO #5 What is the rationale of this method?
+
+
+# record logs, formatted only when a caller reads them (see LogTemplate)
+PERSONNEL_SALARY_LOG = """
+    Year: {year}
+    Personnel to Support Programme Area: {programme_area}
+    Personnel: {role} (ISCO-08: {cadre})
+    In {division} division, at {fte:,.2f} FTE, performing {activities} activities
+    Annual Salary @ 1FTE: {currency}{currency_year}: {annual_salary:,.2f}
+    Total Salary: {currency}{currency_year}: {salary:,.2f}
+    Total Salary Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+    """
+
+PERSONNEL_OFFICE_SUPPLIES_LOG = """
+            Year: {year}
+            Office Supplies for {role} in {division} supporting Programme {programme_area}
+            Item: {item}
+            Cost of Item: {currency}{currency_year}: {cost:,.2f}
+            Cost of Item Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+            """
+
+PERSONNEL_TRANSPORT_LOG = """
+        Year: {year}
+        Transport to support {role} in {division} division, supporting Programme {programme_area}
+        Type of Car: {vehicle}
+        Proportion of Car needed to support role: {cars_needed:,.2f}
+        Annual kms driven: {kms_driven:,.2f}
+        Operational cost per km: {currency}{currency_year}: {operational_cost:,.2f}
+        Therefore, total operational cost: {currency}{currency_year}: {total_operational_cost:,.2f}
+        Total operational cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+PERSONNEL_FUEL_LOG = """
+        Year: {year}
+        Fuel for {cars_needed:,.2f} x {vehicle} to support {role} in {division} division, supporting Programme {programme_area}
+        Annual kms driven: {kms_driven:,.2f}
+        Fuel cost per km: {currency}{currency_year}: {fuel_cost:,.2f}
+        Therefore, total fuel cost: {currency}{currency_year}: {total_fuel_cost:,.2f}
+        Total fuel cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+MEETING_ROOM_HIRE_LOG = """
+    Year: {year}
+    Room hire for {division} Room
+    Room Size: {room_size}m2
+    For {days} days per meeting.
+    For {number_of_meetings:,.2f} meetings.
+    Total Cost: {currency}{currency_year}: {cost:,.2f}
+    Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+    """
+
+MEETING_PER_DIEMS_LOG = """
+        Year: {year}
+        Per diems for visiting attendees for {days} days for {number_of_meetings:,.2f} meetings.
+        Per diems: {currency}{currency_year}: {per_diems:,.2f}
+        Total Cost: {currency}{currency_year}: {cost:,.2f}
+        Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+MEETING_LOCAL_ATTENDANCE_LOG = """
+        Year: {year}
+        {attendee_label}: Salary for {quantity} local attendees for {days} days for {number_of_meetings:,.2f} meetings.
+        Daily Salary: {currency}{currency_year}: {daily_salary:,.2f}
+        Total Cost: {currency}{currency_year}: {cost:,.2f}
+        Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+MEETING_TRAVEL_LOG = """
+        Year: {year}
+        {attendee_label}: Travel for {quantity} attendees for {number_of_meetings:,.2f} meetings
+        Distance Travelled: {distance_travelled_in_km:,.2f}km
+        Vehicle Operating Cost: {currency}{currency_year}: {vehicle_operating_cost_per_km:,.2f} 
+        Vehicle Fuel Consumption: {vehicle_fuel_consumption_per_km:,.2f}L/km
+        Total Cost: {currency}{currency_year}: {cost:,.2f}
+        Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+MEDIA_NEWSPAPER_LOG = """
+    Year: {year}
+    Mass Media Campaign Using Newspaper
+    Words per insert: {words_per_insert}
+    Inserts per year: {inserts_per_year:,.2f}
+    Cost per insert: {currency}{currency_year}: {cost:,.2f}
+    Total Cost: {currency}{currency_year}: {total_cost:,.2f}
+    Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+    """
+
+MEDIA_AIRTIME_LOG = """
+    Year: {year}
+    Airtime for {label}
+    Campaigns per year: {campaigns_per_year} 
+    Days per campaign: {days_per_campaign}
+    Advertisements per day: {advertisements_per_day}
+    Minutes per advertisement: {minutes_per_advertisement}
+    Total Airtime: {total_airtime:,.2f}
+    Cost per minute: {currency}{currency_year}: {mass_media_cost:,.2f}
+    Total Cost: {currency}{currency_year}: {cost:,.2f}
+    Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+    """
+
+MEDIA_WALL_POSTERS_LOG = """
+        Year: {year}
+        Wall posters for {health_facility_type} (A {division} facility)
+        Cost per health facility: {currency}{currency_year}: {cost:,.2f}
+        Total Cost: {currency}{currency_year}: {total_cost:,.2f}
+        Total Cost Rebased: {awaiting_currency}{awaiting_currency_year}: {awaiting_cost}
+        """
+
+
+class LogTemplate:
+    """
+    A record log whose formatting is deferred until it is needed.
+
+    Records carry the template and the values to fill it with. The log is
+    only formatted when the rebased cost is known, via ``format``, which
+    takes the same awaiting_* fields as a pre-formatted log string.
+    Callers that never read the logs never pay for the formatting.
+
+    Parameters
+    ----------
+    template : str
+        A str.format template.
+    **values
+        The fields of the template known when the record is created.
+    """
+    __slots__ = ("template", "values")
+
+    def __init__(self, template, **values):
+        self.template = template
+        self.values = values
+
+    def format(self, **awaiting):
+        """
+        Return the log, filling the remaining fields of the template.
+
+        Parameters
+        ----------
+        **awaiting
+            The fields that were not known when the record was created,
+            e.g. awaiting_cost.
+
+        Returns
+        -------
+        str
+            The formatted log.
+        """
+        return self.template.format(**self.values, **awaiting)
+
+
+# The reference data lookups are cached per connection with reference_cache.
+# The precompute_* functions read everything a run can ask for from a table,
+# e.g. a country's population for every year, in a single query. The serve_*
+# functions then look values up in the result instead of querying per call.
+REFERENCE_CACHES = []
+
+
+def reference_cache(maxsize):
+    """
+    Cache a reference data lookup, keyed on its arguments including the
+    connection, and register it with clear_reference_caches.
+
+    The price database is opened read-only and immutable, so the cached
+    lookups stay valid for as long as the connection is open, across runs.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of entries, see functools.lru_cache.
+
+    Returns
+    -------
+    callable
+        The decorator.
+    """
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        REFERENCE_CACHES.append(cached)
+        return cached
+
+    return decorator
+
+
+def clear_reference_caches():
+    """
+    Clear the cached reference data lookups.
+
+    Runs don't need this. It is for callers that change the database
+    behind an open connection, or that want to release the connections
+    held by the caches.
+    """
+    for cache in REFERENCE_CACHES:
+        cache.cache_clear()
+
+
 def calculate_discount(discount_rate, year, start):
     """
     Calculate the discount for the given year
@@ -16,17 +325,19 @@ def calculate_discount(discount_rate, year, start):
     ----------
     discount_rate : float
         The discount rate.
-    year : int
-        The year.
+    year : int or np.ndarray
+        The year, or an array of years.
     start : int
         The start year.
 
     Returns
     -------
-    float
-        The current discount to be applied this year
+    float or np.ndarray
+        The current discount to be applied this year, or in each year
     """
-    return 1 / discount_rate ** (year - start)
+    # a float rate, so that an integer rate over an array of years is not
+    # raised to the power in int64, which overflows
+    return 1 / float(discount_rate) ** (year - start)
 
 
 def get_personnel_records(component, conn, country, year, start_year):
@@ -72,31 +383,7 @@ def get_personnel_records(component, conn, country, year, start_year):
     # iterate through personnel list, calculate annual salary
     records = []
 
-    NEED_CARS_AND_TRAVEL = ["Transport Driver"]
-    CAR_PREFERENCE = "Toyota Hiace passenger van"
-    DONT_NEED_OFFICE_SUPPLIES = ["Cleaner", "Transport Driver"]
-    OFFICE_SUPPLIES = [
-        {
-            "item": "Computer   ",
-            "per person": 0.5,
-            "useful life years": 5
-        },
-        {
-            "item": "Multifunciton Photocopier, Fax, Printer and Scanner ",
-            "per person": 0.125,
-            "useful life years": 5
-        }
-        ]
-
-
-    # add unit costs to OFFICE_SUPPLIES
-    for item in OFFICE_SUPPLIES:
-        unit_cost, currency_information = serve_supply_costs(item["item"], conn)
-        item["unit cost"] = unit_cost
-        item["currency"] = currency_information[0]
-        item["currency year"] = currency_information[1]
-        item["annualised cost"] = calculate_annualised_cost(unit_cost, item["useful life years"])
-
+    office_supplies = precompute_office_supplies(conn)
 
     # unpack kwargs
     programme_area = component["Programme Area"]
@@ -113,15 +400,20 @@ def get_personnel_records(component, conn, country, year, start_year):
     salary = annual_salary * fte
 
     # Write a log for this record
-    log = f"""
-    Year: {year}
-    Personnel to Support Programme Area: {programme_area}
-    Personnel: {role} (ISCO-08: {cadre})
-    In {division} division, at {fte:,.2f} FTE, performing {activities} activities
-    Annual Salary @ 1FTE: {currency_information[0]}{currency_information[1]}: {annual_salary:,.2f}
-    Total Salary: {currency_information[0]}{currency_information[1]}: {salary:,.2f}
-    Total Salary Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-    """
+    log = LogTemplate(
+        PERSONNEL_SALARY_LOG,
+        year=year,
+        programme_area=programme_area,
+        role=role,
+        cadre=cadre,
+        division=division,
+        fte=fte,
+        activities=activities,
+        currency=currency_information[0],
+        currency_year=currency_information[1],
+        annual_salary=annual_salary,
+        salary=salary
+    )
     resource_information = (
         "Personnel", 
         role, 
@@ -137,17 +429,21 @@ def get_personnel_records(component, conn, country, year, start_year):
 
     # determine their need for office supplies
     if role not in DONT_NEED_OFFICE_SUPPLIES:
-        for item in OFFICE_SUPPLIES:
+        for item in office_supplies:
             cost = fte * item["per person"] * item["annualised cost"]
             cost_information = (cost, item["currency"], item["currency year"])
 
-            log = f"""
-            Year: {year}
-            Office Supplies for {role} in {division} supporting Programme {programme_area}
-            Item: {item["item"]}
-            Cost of Item: {item["currency"]}{item["currency year"]}: {cost:,.2f}
-            Cost of Item Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-            """
+            log = LogTemplate(
+                PERSONNEL_OFFICE_SUPPLIES_LOG,
+                year=year,
+                role=role,
+                division=division,
+                programme_area=programme_area,
+                item=item["item"],
+                currency=item["currency"],
+                currency_year=item["currency year"],
+                cost=cost
+            )
             quantity = fte * item["per person"]
             resource_information = (
                 "Office Supplies", 
@@ -163,21 +459,26 @@ def get_personnel_records(component, conn, country, year, start_year):
     if role in NEED_CARS_AND_TRAVEL:
         # Each FTE needs half a car  TODO #6 - Interrogate this rule
         cars_needed = fte * 0.5
-        km_per_car = calculate_km_travelled_per_year(division, CAR_PREFERENCE)
+        # the same for every division and vehicle, see calculate_km_travelled_per_year
+        km_per_car = KM_TRAVELLED_PER_YEAR
         kms_driven = cars_needed * km_per_car
         operational_cost, currency_information = serve_vehicle_operating_cost(CAR_PREFERENCE, conn)
         total_operational_cost = operational_cost * kms_driven
 
-        log = f"""
-        Year: {year}
-        Transport to support {role} in {division} division, supporting Programme {programme_area}
-        Type of Car: {CAR_PREFERENCE}
-        Proportion of Car needed to support role: {cars_needed:,.2f}
-        Annual kms driven: {kms_driven:,.2f}
-        Operational cost per km: {currency_information[0]}{currency_information[1]}: {operational_cost:,.2f}
-        Therefore, total operational cost: {currency_information[0]}{currency_information[1]}: {total_operational_cost:,.2f}
-        Total operational cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            PERSONNEL_TRANSPORT_LOG,
+            year=year,
+            role=role,
+            division=division,
+            programme_area=programme_area,
+            vehicle=CAR_PREFERENCE,
+            cars_needed=cars_needed,
+            kms_driven=kms_driven,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            operational_cost=operational_cost,
+            total_operational_cost=total_operational_cost
+        )
         resource_information = (
             "Transport - Operational Costs", 
             "KMs Driven * OpEx", 
@@ -191,14 +492,20 @@ def get_personnel_records(component, conn, country, year, start_year):
 
         fuel_cost, currency_information = serve_vehicle_fuel_consumption(CAR_PREFERENCE, conn)
         total_fuel_cost = fuel_cost * kms_driven
-        log = f"""
-        Year: {year}
-        Fuel for {cars_needed:,.2f} x {CAR_PREFERENCE} to support {role} in {division} division, supporting Programme {programme_area}
-        Annual kms driven: {kms_driven:,.2f}
-        Fuel cost per km: {currency_information[0]}{currency_information[1]}: {fuel_cost:,.2f}
-        Therefore, total fuel cost: {currency_information[0]}{currency_information[1]}: {total_fuel_cost:,.2f}
-        Total fuel cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            PERSONNEL_FUEL_LOG,
+            year=year,
+            role=role,
+            division=division,
+            programme_area=programme_area,
+            vehicle=CAR_PREFERENCE,
+            cars_needed=cars_needed,
+            kms_driven=kms_driven,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            fuel_cost=fuel_cost,
+            total_fuel_cost=total_fuel_cost
+        )
         resource_information = (
             "Transport - Fuel Costs", 
             "KMs Driven * Fuel", 
@@ -213,6 +520,36 @@ def get_personnel_records(component, conn, country, year, start_year):
     return records
 
 
+@reference_cache(maxsize=16)
+def precompute_office_supplies(conn):
+    """
+    Return the office supplies needed per person, with their unit costs.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    tuple
+        A copy of each entry of OFFICE_SUPPLIES, with the unit cost,
+        currency, currency year and annualised cost added.
+    """
+    office_supplies = []
+    for item in OFFICE_SUPPLIES:
+        unit_cost, currency_information = serve_supply_costs(item["item"], conn)
+        office_supplies.append({
+            **item,
+            "unit cost": unit_cost,
+            "currency": currency_information[0],
+            "currency year": currency_information[1],
+            "annualised cost": calculate_annualised_cost(unit_cost, item["useful life years"])
+        })
+
+    return tuple(office_supplies)
+
+
 def get_meeting_records(component, conn, country, year, start_year):
     """
     Return a list of who attended a meeting, and the cost of attending.
@@ -293,19 +630,30 @@ def get_meeting_records(component, conn, country, year, start_year):
 
     number_of_meetings = serve_number_of_divisions(country, division, conn) * scale
 
+    # split attendees into visiting and local in a single pass
+    visiting_attendees = []
+    local_attendees = []
+    for attendee in attendees:
+        if attendee[1] == "visiting":
+            visiting_attendees.append(attendee)
+        elif attendee[1] == "local":
+            local_attendees.append(attendee)
+
     # room hire
     room_hire_cost_per_day, currency_information = calculate_room_hire(country, division, year, room_size, conn)
     room_hire_cost_total = room_hire_cost_per_day * days * number_of_meetings
 
-    log = f"""
-    Year: {year}
-    Room hire for {division} Room
-    Room Size: {room_size}m2
-    For {days} days per meeting.
-    For {number_of_meetings:,.2f} meetings.
-    Total Cost: {currency_information[0]}{currency_information[1]}: {room_hire_cost_total:,.2f}
-    Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-    """
+    log = LogTemplate(
+        MEETING_ROOM_HIRE_LOG,
+        year=year,
+        division=division,
+        room_size=room_size,
+        days=days,
+        number_of_meetings=number_of_meetings,
+        currency=currency_information[0],
+        currency_year=currency_information[1],
+        cost=room_hire_cost_total
+    )
     resource_information = (
         "Meeting", 
         "Room Hire Costs",
@@ -318,19 +666,21 @@ def get_meeting_records(component, conn, country, year, start_year):
 
     # per diems for visiting attendees
     # days * attendees * per_diems
-    visiting_attendees = [a for a in attendees if a[1] == "visiting"]
-    per_diems, currency_information = serve_per_diem(country, division, conn, True)
+    per_diems, currency_information = serve_per_diem(country, division, conn, local=True)
     for visiting_attendee in visiting_attendees:
         attendee_label, _, attendees_requiring_per_diems, _ = visiting_attendee
         cost = days * attendees_requiring_per_diems * per_diems * number_of_meetings
 
-        log = f"""
-        Year: {year}
-        Per diems for visiting attendees for {days} days for {number_of_meetings:,.2f} meetings.
-        Per diems: {currency_information[0]}{currency_information[1]}: {per_diems:,.2f}
-        Total Cost: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-        Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            MEETING_PER_DIEMS_LOG,
+            year=year,
+            days=days,
+            number_of_meetings=number_of_meetings,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            per_diems=per_diems,
+            cost=cost
+        )
 
         resource_information = (
             "Meeting", 
@@ -344,20 +694,24 @@ def get_meeting_records(component, conn, country, year, start_year):
         records.append(record)
 
     # opportunity cost (days of salary) for local attendees
-    local_attendees = [a for a in attendees if a[1] == "local"]
     cadre = 2  # FIXME #2 - Assuming cadre of support staff is 2
     daily_salary, currency_information = calculate_daily_salary(country, cadre, conn)
     for local_attendee in local_attendees:
         attendee_label, _, quantity, _ = local_attendee
         cost = days * quantity * daily_salary * number_of_meetings
 
-        log = f"""
-        Year: {year}
-        {attendee_label}: Salary for {quantity} local attendees for {days} days for {number_of_meetings:,.2f} meetings.
-        Daily Salary: {currency_information[0]}{currency_information[1]}: {daily_salary:,.2f}
-        Total Cost: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-        Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            MEETING_LOCAL_ATTENDANCE_LOG,
+            year=year,
+            attendee_label=attendee_label,
+            quantity=quantity,
+            days=days,
+            number_of_meetings=number_of_meetings,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            daily_salary=daily_salary,
+            cost=cost
+        )
 
         resource_information = (
             "Meeting",
@@ -371,23 +725,26 @@ def get_meeting_records(component, conn, country, year, start_year):
         records.append(record)
 
     # travel = attendees * ddist * operational cost of car
-    vehicle_operating_cost_per_km, currency_information = serve_vehicle_operating_cost(preferred_vehicle, conn)
-    vehicle_fuel_consumption_per_km, currency_information = serve_vehicle_fuel_consumption(preferred_vehicle, conn)
+    vehicle_operating_cost_per_km, vehicle_fuel_consumption_per_km, currency_information = serve_vehicle_costs(preferred_vehicle, conn)
     distance_travelled_in_km = serve_distance_between_regions(country, "DDist95", conn)  # FIXME #3 - Interrogate this assumption
     cost_of_travel_per_attendee = distance_travelled_in_km * vehicle_operating_cost_per_km * vehicle_fuel_consumption_per_km
     for attendee in attendees:
         attendee_label, _, _, quantity = attendee
         cost = quantity * cost_of_travel_per_attendee * number_of_meetings
 
-        log = f"""
-        Year: {year}
-        {attendee_label}: Travel for {quantity} attendees for {number_of_meetings:,.2f} meetings
-        Distance Travelled: {distance_travelled_in_km:,.2f}km
-        Vehicle Operating Cost: {currency_information[0]}{currency_information[1]}: {vehicle_operating_cost_per_km:,.2f} 
-        Vehicle Fuel Consumption: {vehicle_fuel_consumption_per_km:,.2f}L/km
-        Total Cost: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-        Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            MEETING_TRAVEL_LOG,
+            year=year,
+            attendee_label=attendee_label,
+            quantity=quantity,
+            number_of_meetings=number_of_meetings,
+            distance_travelled_in_km=distance_travelled_in_km,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            vehicle_operating_cost_per_km=vehicle_operating_cost_per_km,
+            vehicle_fuel_consumption_per_km=vehicle_fuel_consumption_per_km,
+            cost=cost
+        )
         resource_information = (
             "Meeting",
             "Travel Costs for Attendees",
@@ -430,17 +787,8 @@ def get_media_records(component, conn, country, year, start_year):
         each entry is a tuple of the form:
 
     """
-    media_to_function = {
-        "Radio time (minutes)": get_airtime_records,
-        "Television time (minutes)": get_airtime_records,
-        "Newspapers (100 word insert)": get_newspaper_records,
-        "Wall posters": get_wall_poster_records,
-        "Flyers / leaflets (per leaflet)": get_flyers_leaflet_records,
-        "Social media": get_social_media_records,
-        "Text messaging": get_text_messaging_records
-    }
     label = component["label"]
-    records = media_to_function[label](component, country, year, conn)
+    records = MEDIA_RECORD_FUNCTIONS[label](component, country, year, conn)
     return  records
 
 
@@ -515,7 +863,8 @@ def get_flyers_leaflet_records(component, country, year, conn):
         a list of tuples of the form:
         record = (year, log, resource_information, cost_information)
     """
-    ...
+    # FIXME This is a placeholder
+    return []
 
 
 def get_newspaper_records(component, country, year, conn):
@@ -556,15 +905,16 @@ def get_newspaper_records(component, country, year, conn):
     inserts_per_year = fit_FTE(inserts_per_year, country, year, division, conn)
     cost, currency_information = calculate_mass_media_costs(label, country, year, conn)
     total_cost = cost * inserts_per_year
-    log = f"""
-    Year: {year}
-    Mass Media Campaign Using Newspaper
-    Words per insert: {words_per_insert}
-    Inserts per year: {inserts_per_year:,.2f}
-    Cost per insert: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-    Total Cost: {currency_information[0]}{currency_information[1]}: {total_cost:,.2f}
-    Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-    """
+    log = LogTemplate(
+        MEDIA_NEWSPAPER_LOG,
+        year=year,
+        words_per_insert=words_per_insert,
+        inserts_per_year=inserts_per_year,
+        currency=currency_information[0],
+        currency_year=currency_information[1],
+        cost=cost,
+        total_cost=total_cost
+    )
     resource_information = (
         "Mass Media",
         "Newspaper",
@@ -623,18 +973,20 @@ def get_airtime_records(component, country, year, conn):
     )
     total_airtime = fit_FTE(total_airtime, country, year, division, conn)
     cost = mass_media_cost * total_airtime
-    log = f"""
-    Year: {year}
-    Airtime for {label}
-    Campaigns per year: {campaigns_per_year} 
-    Days per campaign: {days_per_campaign}
-    Advertisements per day: {advertisements_per_day}
-    Minutes per advertisement: {minutes_per_advertisement}
-    Total Airtime: {total_airtime:,.2f}
-    Cost per minute: {currency_information[0]}{currency_information[1]}: {mass_media_cost:,.2f}
-    Total Cost: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-    Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-    """
+    log = LogTemplate(
+        MEDIA_AIRTIME_LOG,
+        year=year,
+        label=label,
+        campaigns_per_year=campaigns_per_year,
+        days_per_campaign=days_per_campaign,
+        advertisements_per_day=advertisements_per_day,
+        minutes_per_advertisement=minutes_per_advertisement,
+        total_airtime=total_airtime,
+        currency=currency_information[0],
+        currency_year=currency_information[1],
+        mass_media_cost=mass_media_cost,
+        cost=cost
+    )
     resource_information = (
         "Airtime",
         label, 
@@ -672,16 +1024,11 @@ def get_wall_poster_records(component, country, year, conn):
         record = (year, log, resource_information, cost_information)
     """
     label = component["label"]
-    HEALTH_FACILITY_MAPPING = {
-        "national": ["regional_hospitals"],
-        "provincial": ["provincial_hospitals"],
-        "district": ["district_hospitals", "health_centres", "health_posts"]
-    }
     cost, currency_information = calculate_mass_media_costs(label, country, year, conn)
 
     division = component["division"]
 
-    division_health_facilities = HEALTH_FACILITY_MAPPING[division]
+    division_health_facilities = HEALTH_FACILITY_TYPES[division]
 
     records = []
     for health_facility_type in division_health_facilities:
@@ -690,13 +1037,16 @@ def get_wall_poster_records(component, country, year, conn):
         # multiply by the cost
         total_cost = number_of_health_facilities * cost
         # create the record
-        log = f"""
-        Year: {year}
-        Wall posters for {health_facility_type} (A {division} facility)
-        Cost per health facility: {currency_information[0]}{currency_information[1]}: {cost:,.2f}
-        Total Cost: {currency_information[0]}{currency_information[1]}: {total_cost:,.2f}
-        Total Cost Rebased: {{awaiting_currency}}{{awaiting_currency_year}}: {{awaiting_cost}}
-        """
+        log = LogTemplate(
+            MEDIA_WALL_POSTERS_LOG,
+            year=year,
+            health_facility_type=health_facility_type,
+            division=division,
+            currency=currency_information[0],
+            currency_year=currency_information[1],
+            cost=cost,
+            total_cost=total_cost
+        )
         resource_information = (
             "Wall Posters",
             health_facility_type, 
@@ -710,6 +1060,46 @@ def get_wall_poster_records(component, country, year, conn):
     return records
 
 
+# the records function for each media label, see get_media_records
+MEDIA_RECORD_FUNCTIONS = {
+    "Radio time (minutes)": get_airtime_records,
+    "Television time (minutes)": get_airtime_records,
+    "Newspapers (100 word insert)": get_newspaper_records,
+    "Wall posters": get_wall_poster_records,
+    "Flyers / leaflets (per leaflet)": get_flyers_leaflet_records,
+    "Social media": get_social_media_records,
+    "Text messaging": get_text_messaging_records
+}
+
+
+@reference_cache(maxsize=256)
+def precompute_population(country, conn):
+    """
+    Return the total population of a country for every year from 1950 to 2100.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    np.ndarray
+        The population of the country, indexed by year - 1950.
+    """
+    rows = conn.execute(POPULATION_QUERY, (country, "Median", 1950, 2100))
+
+    # missing years, and years without a value, have a population of 0
+    population = np.zeros(2100 - 1950 + 1)
+    for year, value in rows:
+        if value is not None:
+            population[year - 1950] = value
+
+    return population
+
+
 def serve_population(country, year, conn) :
     """
     Return the total population in given year
@@ -725,29 +1115,32 @@ def serve_population(country, year, conn) :
 
     Returns
     -------
-    np.ndarray
-        2 x 101 ndarray of the population of a country in a specific year.
+    float
+        The population of the country in a specific year.
     """
-    if year < 1950:
-        year = 1950
-    elif year > 2100:
-        year = 2100
+    year = max(1950, min(2100, year))
+    # a Python float, so that callers round it the way they round other values
+    return float(precompute_population(country, conn)[year - 1950])
 
-    query = f"""
-        SELECT Value
-        FROM population
-        WHERE Iso3 = ? 
-        AND Time = ?
-        AND Variant = ?
-        """
-    cursor = conn.cursor()
-    cursor.execute(query, (country, year, "Median"))
 
-    result = cursor.fetchone()[0]
-    if result is None:
-        return 0
+@reference_cache(maxsize=256)
+def precompute_divisions(country, conn):
+    """
+    Return the administrative divisions row of a country.
 
-    return result
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    tuple
+        The administrative_divisions row, see DIVISION_COLUMNS.
+    """
+    return conn.execute(DIVISIONS_QUERY, (country, )).fetchone()
 
 
 def serve_number_of_divisions(country, division, conn):
@@ -768,22 +1161,14 @@ def serve_number_of_divisions(country, division, conn):
     int
         The number of divisions.
     """
-    if division.lower() == "national":
+    division = division.lower()
+    if division == "national":
         return 1
 
-    query = f"""
-    SELECT *
-    FROM administrative_divisions
-    WHERE ISO3 = ?
-    """
-    cursor = conn.cursor()
-    cursor.execute(query, (country, ))
-    result = cursor.fetchone()
+    result = precompute_divisions(country, conn)
 
-    if division.lower() == "provincial":
-        return result[1]
-    elif division.lower() == "district":
-        return result[2]
+    if division in DIVISION_COLUMNS:
+        return result[DIVISION_COLUMNS[division]]
 
     return result
 
@@ -812,20 +1197,41 @@ def fit_FTE(FTE, country, year, division, conn):
     float
         The fitted (actual, real) FTE.
     """
+    division = division.lower()
+    standard_population = STANDARD_POPULATIONS.get(division)
+    if standard_population is None:
+        return 0
+
     population = serve_population(country, year, conn)
-    if division.lower() == "national":
-        return FTE * population / 50_000_000
+    if division != "national":
+        population /= serve_number_of_divisions(country, division, conn)
 
-    n_divisions = serve_number_of_divisions(country, division, conn)
-    average_pop_per_division = population / n_divisions
+    return FTE * population / standard_population
 
-    if division.lower() == "provincial":
-        return FTE * average_pop_per_division / 5_000_000
-    elif division.lower() == "district":
-        return FTE * average_pop_per_division / 500_000
-    
-    else:
-        return 0
+
+@reference_cache(maxsize=256)
+def precompute_salaries(country, conn):
+    """
+    Return the annual salaries of every cadre in a country.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    dict
+        The annual salary and a tuple of the currency and currency_year,
+        keyed by cadre.
+    """
+    salaries = {}
+    for cadre, annual_salary, currency, year in conn.execute(SALARIES_QUERY, (country, )):
+        salaries.setdefault(cadre, (annual_salary, (currency, year)))
+
+    return salaries
 
 
 def serve_personnel_annual_salary(country, cadre, conn):
@@ -847,26 +1253,7 @@ def serve_personnel_annual_salary(country, cadre, conn):
         The annual salary.
         A tuple of the currency and currency_year
     """
-    ISO3 = country
-    ISCO_08_level = cadre
-
-    query = f"""
-    SELECT annual_salary, currency, year
-    FROM costs_salaries
-    WHERE ISO3 = ?
-    AND ISCO_08_level = ?
-    """
-
-    cursor = conn.cursor()
-    cursor.execute(query, (ISO3, ISCO_08_level))
-
-    result = cursor.fetchone()
-    if result is None:
-        return 0, (None, None)
-
-    annual_salary, currency, year = result
-    cost_tuple = (currency, year)
-    return annual_salary, cost_tuple
+    return precompute_salaries(country, conn).get(cadre, (0, (None, None)))
 
 
 def calculate_daily_salary(country, cadre, conn):
@@ -889,11 +1276,33 @@ def calculate_daily_salary(country, cadre, conn):
         A tuple of the currency and currency_year
     """
     annual_salary, currency_information = serve_personnel_annual_salary(country, cadre, conn)
-    DAYS_WORKED_PER_YEAR = 230  # FIXME #1 - Should interrogate this assumption
     daily_salary = annual_salary / DAYS_WORKED_PER_YEAR
     return daily_salary, currency_information
 
 
+@reference_cache(maxsize=16)
+def precompute_supply_costs(conn):
+    """
+    Return the price of every office supply and piece of furniture.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    dict
+        The price and a tuple of the currency and currency_year,
+        keyed by item.
+    """
+    supply_costs = {}
+    for item, price, currency, year in conn.execute(SUPPLY_COSTS_QUERY):
+        supply_costs.setdefault(item, (price, (currency, year)))
+
+    return supply_costs
+
+
 def serve_supply_costs(consumable, conn):
     """
     Calculate the cost of purchasing consumables.
@@ -910,18 +1319,7 @@ def serve_supply_costs(consumable, conn):
     float
         The cost of purchasing consumables.
     """
-    query = f"""
-        SELECT price, currency, year
-        FROM office_supplies_and_furniture
-        WHERE item = ?
-        """
-    cursor = conn.cursor()
-    cursor.execute(query, (consumable, ))
-
-    result = cursor.fetchone()
-    consumable_price, currency, year = result
-
-    return consumable_price, (currency, year)
+    return precompute_supply_costs(conn).get(consumable, (0, (None, None)))
 
 
 def calculate_annualised_cost(unit_cost, useful_life_years):
@@ -943,6 +1341,50 @@ def calculate_annualised_cost(unit_cost, useful_life_years):
     return unit_cost / useful_life_years
 
 
+@reference_cache(maxsize=16)
+def precompute_vehicle_costs(conn):
+    """
+    Return the operating cost and fuel consumption of every vehicle per km.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    dict
+        The operating cost, the fuel consumption and a tuple of the
+        currency and currency_year, keyed by vehicle.
+    """
+    vehicle_costs = {}
+    for vehicle, operating_cost, fuel_consumption, currency, year in conn.execute(VEHICLE_COSTS_QUERY):
+        vehicle_costs.setdefault(vehicle, (operating_cost, fuel_consumption, (currency, year)))
+
+    return vehicle_costs
+
+
+def serve_vehicle_costs(vehicle, conn):
+    """
+    Return the operating cost and fuel consumption of a vehicle per km.
+
+    Parameters
+    ----------
+    vehicle : str
+        The type of vehicle.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    float, float, tuple
+        The operating cost of the vehicle.
+        The fuel consumption of the vehicle.
+        The current information of the cost
+    """
+    return precompute_vehicle_costs(conn).get(vehicle, (0, 0, (None, None)))
+
+
 def serve_vehicle_operating_cost(vehicle, conn):
     """
     Return the operating cost of a vehicle per km.
@@ -960,18 +1402,8 @@ def serve_vehicle_operating_cost(vehicle, conn):
         The operating cost of the vehicle.
         The current information of the cost
     """
-    query = f"""
-        SELECT operating_cost_per_km, currency, year
-        FROM costs_transport
-        WHERE vehicle_model = ?
-        """
-    cursor = conn.cursor()
-    cursor.execute(query, (vehicle, ))
-
-    result = cursor.fetchone()
-    vehicle_operating_cost, currency, year = result
-
-    return vehicle_operating_cost, (currency, year)
+    vehicle_operating_cost, _, currency_information = serve_vehicle_costs(vehicle, conn)
+    return vehicle_operating_cost, currency_information
 
 
 def serve_vehicle_fuel_consumption(vehicle, conn):
@@ -991,20 +1423,11 @@ def serve_vehicle_fuel_consumption(vehicle, conn):
         The operating cost of the vehicle.
         The current information of the cost
     """
-    query = f"""
-        SELECT consumption_litres_per_km, currency, year
-        FROM costs_transport
-        WHERE vehicle_model = ?
-        """
-    cursor = conn.cursor()
-    cursor.execute(query, (vehicle, ))
-
-    result = cursor.fetchone()
-    vehicle_fuel_consumption, currency, year = result
-
-    return vehicle_fuel_consumption, (currency, year)
+    _, vehicle_fuel_consumption, currency_information = serve_vehicle_costs(vehicle, conn)
+    return vehicle_fuel_consumption, currency_information
 
 
+@reference_cache(maxsize=4096)
 def serve_distance_between_regions(country, ddist, conn):
     """
     Return the distance between areas in a country in km.
@@ -1028,13 +1451,11 @@ def serve_distance_between_regions(country, ddist, conn):
         FROM distance_between_regions
         WHERE ISO3 = ?
         """
-    cursor = conn.cursor()
-    cursor.execute(query, (country, ))
-
-    result = cursor.fetchone()
-    distance_km = result[0]
+    result = conn.execute(query, (country, )).fetchone()
+    if result is None or result[0] is None:
+        return 0
 
-    return distance_km
+    return result[0]
 
 
 def calculate_room_hire(country, division, year, room_size, conn):
@@ -1055,7 +1476,7 @@ def calculate_room_hire(country, division, year, room_size, conn):
     conn : sqlite3.Connection
         The connection to the database.
     """
-    per_diems, cost_information = serve_per_diem(country, division, conn, False)
+    per_diems, _, cost_information = serve_per_diem_rates(country, division, conn)
     room_cost_per_m2 = per_diems / 35 * 0.6  # FIXME #4 - This is the odd bit
     room_cost = room_cost_per_m2 * room_size
     return room_cost, cost_information
@@ -1083,7 +1504,7 @@ def calculate_km_travelled_per_year(
     float
         The number of kilometers travelled per year.
     """
-    return 1 * 2000 * 12  # TODO #5 What is the rationale of this method?
+    return KM_TRAVELLED_PER_YEAR
 
 
 def calculate_fuel_price(country, vehicle, price_db):
@@ -1116,30 +1537,54 @@ def serve_per_diem(country, division, conn, local=False):
         The connection to the database.
     local : bool
         Whether to retrieve the local per diem rate.
+
+    Raises
+    ------
+    ValueError
+        If the local rate is requested but the country has no per diem or
+        local proportion.
     """
-    if division.lower() == "national":
-        dsa = "dsa_national"
-    elif division.lower() == "provincial":
-        dsa = "dsa_upper"
-    elif division.lower() == "district":
-        dsa = "dsa_lower"
+    per_diem, local_per_diem, currency_information = serve_per_diem_rates(country, division, conn)
+    if local:
+        if local_per_diem is None:
+            raise ValueError(f"There is no local per diem rate for {country} ({division}).")
+        return local_per_diem, currency_information
+    return per_diem, currency_information
 
-    query = f"""
-        SELECT {dsa}, currency, year, local_proportion
-        FROM costs_per_diems
-        WHERE ISO3 = ?
-        """
 
-    cursor = conn.cursor()
-    cursor.execute(query, (country, ))
+@reference_cache(maxsize=4096)
+def serve_per_diem_rates(country, division, conn):
+    """
+    Retrieve both the full and local per diem rates for a country from one row.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    division : str
+        The division of the personnel.
+    conn : sqlite3.Connection
+        The connection to the database.
 
-    result = cursor.fetchone()
+    Returns
+    -------
+    tuple
+        per_diem, local_per_diem, (currency, year)
+        local_per_diem is None if the row has no per diem or local_proportion.
+    """
+    query = PER_DIEM_QUERIES[division.lower()]
+    result = conn.execute(query, (country, )).fetchone()
+    if result is None:
+        return 0, 0, (None, None)
     per_diem, currency, year, local_proportion = result
 
-    if local:
-        per_diem *= local_proportion
+    # the per diems of visiting meeting attendees use the local rate,
+    # the full rate is used on its own, e.g. by calculate_room_hire
+    local_per_diem = None
+    if per_diem is not None and local_proportion is not None:
+        local_per_diem = per_diem * local_proportion
 
-    return per_diem, (currency, year)
+    return per_diem, local_per_diem, (currency, year)
 
 
 def rebase_currency(
@@ -1186,86 +1631,274 @@ def rebase_currency(
     - Change to different currency via WB-PPP rates
     - Rebase to desired year using WB-GDP deflators
     """
+    rates, desired_country, desired_year = serve_rebase_rates(
+        current_country,
+        current_year,
+        desired_country,
+        desired_year,
+        conn
+    )
+    current_ppp, desired_ppp, deflation_rate = rates
+    return cost / current_ppp * desired_ppp * deflation_rate * discount, desired_country, desired_year
+
+
+def rebase_currency_records(
+        costs,
+        current_countries,
+        current_years,
+        desired_country,
+        desired_year,
+        discounts,
+        conn
+    ):
+    """
+    Rebase an array of costs, each in its own currency and year.
+    The conversion rates are looked up once per distinct currency and year.
+
+    Parameters
+    ----------
+    costs : np.ndarray
+        The costs to rebase.
+    current_countries : sequence of str
+        The ISO3 of the currency of each cost.
+    current_years : sequence of int
+        The year of each cost.
+    desired_country : str
+        The ISO3 of the currency to rebase to.
+    desired_year : int
+        The year to rebase to.
+    discounts : float or np.ndarray
+        The discount to apply, either one for all costs or one per cost.
+
+    Returns
+    -------
+    np.ndarray, str, int
+        The rebased costs, and the currency and year they are in.
+    """
+    conversions = {}
+    rates = []
+    for current in zip(current_countries, current_years):
+        if current not in conversions:
+            conversions[current] = serve_rebase_rates(
+                current[0],
+                current[1],
+                desired_country,
+                desired_year,
+                conn
+            )
+        record_rates, desired_country, desired_year = conversions[current]
+        rates.append(record_rates)
+
+    # one column per rate, applied in the same order as rebase_currency
+    current_ppp, desired_ppp, deflation_rate = np.array(rates, dtype=np.float64).reshape(-1, 3).T
+    costs = np.asarray(costs, dtype=np.float64)
+    return costs / current_ppp * desired_ppp * deflation_rate * discounts, desired_country, desired_year
+
+
+@reference_cache(maxsize=4096)
+def serve_rebase_rates(
+        current_country,
+        current_year,
+        desired_country,
+        desired_year,
+        conn
+    ):
+    """
+    Return the rates that convert a cost from one currency and year to
+    another, without discounting.
+    A cost is rebased as cost / current_ppp * desired_ppp * deflation_rate.
+
+    Parameters
+    ----------
+    current_country : str
+        The ISO3 of the currency of the cost.
+    current_year : int
+        The year of the cost.
+    desired_country : str
+        The ISO3 of the currency to rebase to.
+    desired_year : int
+        The year to rebase to.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    tuple, str, int
+        The current_ppp, desired_ppp and deflation_rate, each 1 when no
+        conversion is needed, and the currency and year they rebase to.
+    """
     # if either currency is called USD, change this to USA
     if current_country == "USD":
         current_country = "USA"
     if desired_country == "USD":
         desired_country = "USA"
 
-    if current_year < 1960:
+    # years inside the range of the WB-GDP deflators skip the warnings
+    if not 1960 <= desired_year <= 2021:
         warnings.warn(
-            f"Current year is {current_year}. "
-            "This is before the earliest year of the WB-GDP deflators. "
+            f"Desired year is {desired_year}. "
+            f"This is {'before the earliest' if desired_year < 1960 else 'after the latest'} "
+            "year of the WB-GDP deflators. "
             "Rebasing will not be accurate."
             )
-        current_year = 1960
-    if desired_year < 1960:
+        desired_year = min(2021, max(1960, desired_year))
+
+    # lookups without a matching row return (None, None) currency
+    # information, e.g. serve_supply_costs, so the cost counts as 0
+    if current_country is None or current_year is None:
         warnings.warn(
-            f"Desired year is {current_year}. "
-            "This is before the earliest year of the WB-GDP deflators. "
-            "Rebasing will not be accurate."
+            "A cost has no currency or year, as its reference data is missing. "
+            "It is counted as 0."
             )
-        desired_year = 1960
-    if current_year > 2021:
+        return (1.0, 1.0, 0.0), desired_country, desired_year
+
+    if not 1960 <= current_year <= 2021:
         warnings.warn(
             f"Current year is {current_year}. "
-            "This is after the latest year of the WB-GDP deflators. "
-            "Rebasing will not be accurate."
-            )
-        current_year = 2021
-    if desired_year > 2021:
-        warnings.warn(
-            f"Desired year is {current_year}. "
-            "This is after the latest year of the WB-GDP deflators. "
+            f"This is {'before the earliest' if current_year < 1960 else 'after the latest'} "
+            "year of the WB-GDP deflators. "
             "Rebasing will not be accurate."
             )
-        desired_year = 2021
+        current_year = min(2021, max(1960, current_year))
 
-    cursor = conn.cursor()
+    current_ppp = desired_ppp = deflation_rate = 1.0
 
     # convert to PPP, then convert from PPP to the desired country currency
     if desired_country != current_country:
-        query = f"""
-            SELECT "{current_year} [YR{current_year}]" FROM "economic_statistics"
-            WHERE "Country Code" = ?
-            AND "Series Name" = "PPP conversion factor, GDP (LCU per international $)"
-            """
-        cursor.execute(query, (current_country, ))
-        to_PPP = float(cursor.fetchone()[0])
-        ppp = cost / to_PPP
-
-        query = f"""
-            SELECT "{current_year} [YR{current_year}]" FROM "economic_statistics"
-            WHERE "Country Code" = ?
-            AND "Series Name" = "PPP conversion factor, GDP (LCU per international $)"
-            """
-        cursor.execute(query, (desired_country, ))
-        to_PPP = float(cursor.fetchone()[0])
-        cost = ppp * to_PPP
+        current_ppp = serve_economic_statistic(current_country, PPP_SERIES, current_year, conn)
+        desired_ppp = serve_economic_statistic(desired_country, PPP_SERIES, current_year, conn)
 
     # convert the current year to the desired year, using deflators
     if current_year != desired_year:
-        query = """
-            SELECT * FROM "economic_statistics"
-            WHERE "Country Code" = ?
-            AND "Series Name" = "GDP deflator (base year varies by country)"
-            """
-        cursor.execute(query, (current_country, ))
-        gdp_deflators = cursor.fetchall()[0][4:]  # Before this is text
-
-        first_year = 1960
-        requested_index = desired_year - first_year
-        current_index = current_year - first_year
-        gdp_deflator_requested = float(gdp_deflators[requested_index])
-        gdp_deflator_current = float(gdp_deflators[current_index])
+        gdp_deflator_requested = serve_economic_statistic(current_country, GDP_DEFLATOR_SERIES, desired_year, conn)
+        gdp_deflator_current = serve_economic_statistic(current_country, GDP_DEFLATOR_SERIES, current_year, conn)
 
         deflation_rate = gdp_deflator_requested / gdp_deflator_current
-        cost = cost * deflation_rate
 
-    # apply discount
-    cost *= discount
+    return (current_ppp, desired_ppp, deflation_rate), desired_country, desired_year
 
-    return cost, desired_country, desired_year
+
+@reference_cache(maxsize=16)
+def precompute_economic_statistics(series, conn):
+    """
+    Return a World Bank series for every country, for every year from 1960 to 2021.
+
+    Parameters
+    ----------
+    series : str
+        The name of the series, e.g. "GDP deflator (base year varies by country)"
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    dict, np.ndarray
+        The row of each country code in the matrix, and the matrix of the
+        series indexed by [row, year - 1960].
+        Missing values are NaN.
+    """
+    cursor = conn.execute(ECONOMIC_STATISTICS_QUERY, (series, ))
+
+    # year columns are named e.g. "1960 [YR1960]", the rest are text
+    columns = [description[0] for description in cursor.description]
+    country_column = columns.index("Country Code")
+    year_columns = [
+        (j, int(column[:4]) - 1960)
+        for j, column in enumerate(columns)
+        if column[:4].isdigit() and 1960 <= int(column[:4]) <= 2021
+    ]
+
+    rows = {}
+    values = []
+    for row in cursor:
+        if row[country_column] in rows:
+            continue
+        rows[row[country_column]] = len(values)
+        country_values = np.full(2021 - 1960 + 1, np.nan)
+        for j, i in year_columns:
+            try:
+                country_values[i] = float(row[j])
+            except (TypeError, ValueError):
+                pass
+        values.append(country_values)
+
+    return rows, np.array(values).reshape(len(values), 2021 - 1960 + 1)
+
+
+def serve_economic_statistics(country, series, conn):
+    """
+    Return a World Bank series for a country, for every year from 1960 to 2021.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    series : str
+        The name of the series, e.g. "GDP deflator (base year varies by country)"
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    np.ndarray
+        The series, indexed by year - 1960.
+        Missing values are NaN.
+    """
+    rows, values = precompute_economic_statistics(series, conn)
+    if country not in rows:
+        return np.full(2021 - 1960 + 1, np.nan)
+    return values[rows[country]]
+
+
+def serve_economic_statistic(country, series, year, conn):
+    """
+    Return a World Bank series value for a country in a particular year.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    series : str
+        The name of the series, e.g. "GDP deflator (base year varies by country)"
+    year : int
+        The year of interest, from 1960 to 2021.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    float
+        The value of the series.
+
+    Raises
+    ------
+    ValueError
+        If the series has no value for the country in that year.
+    """
+    value = float(serve_economic_statistics(country, series, conn)[year - 1960])
+    if np.isnan(value):
+        raise ValueError(f"There is no '{series}' value for {country} in {year}.")
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def load_cadre_lookup(path=CADRE_LOOKUP_PATH):
+    """
+    Load the lookup table of roles to cadres.
+    The table is static, so it is read once per path.
+
+    Parameters
+    ----------
+    path : str
+        The path to the JSON lookup table.
+
+    Returns
+    -------
+    dict
+        The cadre of each role.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 def serve_cadre_from_role(role):
@@ -1284,19 +1917,35 @@ def serve_cadre_from_role(role):
         The cadre of the personnel.
         Between 1 - 5
     """
-    query = """
-        SELECT cadre
-        FROM cadre
-        WHERE role = ?
-        """
-    with open("./data/personnel_cadre.json", "r", encoding="utf-8") as f:
-        cadre_lookup = json.load(f)
-
-    cadre = cadre_lookup[role]
+    cadre = load_cadre_lookup()[role]
 
     return cadre
 
 
+@reference_cache(maxsize=256)
+def precompute_healthcare_facilities(country, conn):
+    """
+    Return the number of health facilities of every type in HEALTH_FACILITY_TYPES.
+
+    Parameters
+    ----------
+    country : str
+        The ISO3 code of the country.
+    conn : sqlite3.Connection
+        The connection to the database.
+
+    Returns
+    -------
+    dict
+        The number of health facilities, keyed by type.
+        Empty if the country is missing.
+    """
+    result = conn.execute(HEALTHCARE_FACILITIES_BULK_QUERY, (country, )).fetchone()
+    if result is None:
+        return {}
+    return dict(zip(HEALTHCARE_FACILITIES_COLUMNS, result))
+
+
 def serve_healthcare_facilities(country, label, conn):
     """
     Retrieve the number of health facilities in a country of a particular type.
@@ -1315,16 +1964,12 @@ def serve_healthcare_facilities(country, label, conn):
     int
         The number of health facilities.
     """
-    query = """
-        SELECT {label}
-        FROM healthcare_facilities
-        WHERE ISO3 = ?
-        """
+    facilities = precompute_healthcare_facilities(country, conn)
+    if label in facilities:
+        return facilities[label]
 
-    cursor = conn.cursor()
-    cursor.execute(query.format(label=label), (country, ))
-
-    result = cursor.fetchone()
+    query = HEALTHCARE_FACILITIES_QUERY.format(label=label)
+    result = conn.execute(query, (country, )).fetchone()
     return result[0]
 
 
@@ -1394,27 +2039,14 @@ def serve_gdp_per_capita(country, year, conn):
         (cost, currency, year)
     """
     # TODO #8 Get GDP Forecasts to 2100
-    if year < 1960:
+    if not 1960 <= year <= 2021:
         warnings.warn(
             f"Year is {year}. "
-            "This is before the earliest year of the WB-GDP deflators. "
+            f"This is {'before the earliest' if year < 1960 else 'after the latest'} "
+            "year of the WB-GDP deflators. "
             "Rebasing will not be accurate."
             )
-        year = 1960
-    if year > 2021:
-        warnings.warn(
-            f"Year is {year}. "
-            "This is after the latest year of the WB-GDP deflators. "
-            "Rebasing will not be accurate."
-            )
-        year = 2021
-    query = f"""
-        SELECT "{year} [YR{year}]" FROM "economic_statistics"
-        WHERE "Country Code" = ?
-        AND "Series Name" = "GDP per capita, PPP (current international $)"
-        """
-    cursor = conn.cursor()
-    cursor.execute(query, (country, ))
-    cost = float(cursor.fetchone()[0])
+        year = min(2021, max(1960, year))
+    cost = serve_economic_statistic(country, GDP_PER_CAPITA_SERIES, year, conn)
 
     return cost, "USD", year
\ No newline at end of file
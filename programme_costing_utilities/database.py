@@ -0,0 +1,61 @@
+"""
+Provides the connection to the price database.
+"""
+import sqlite3
+
+DATABASE_PATH = "./data/who_choice_price_database.db"
+
+
+def connect(path=DATABASE_PATH):
+    """
+    Open a read-only connection to the price database.
+
+    The price database is static reference data, so it is opened as
+    immutable, which lets SQLite skip file locking entirely, and is
+    memory-mapped so that page reads avoid read() syscalls.
+
+    The lookups run a fixed set of SQL strings, so the prepared statement
+    cache is sized to hold all of them, including the per-column per diem
+    and distance queries, rather than evicting them.
+
+    Parameters
+    ----------
+    path : str
+        The path to the sqlite database.
+
+    Returns
+    -------
+    sqlite3.Connection
+        The database connection.
+    """
+    conn = sqlite3.connect(
+        f"file:{path}?mode=ro&immutable=1",
+        uri=True,
+        check_same_thread=False,
+        cached_statements=256
+    )
+    return prepare_connection(conn)
+
+
+def prepare_connection(conn):
+    """
+    Tune a connection to the price database for a read-only workload.
+
+    Can be applied to connections opened elsewhere, e.g. with a plain
+    sqlite3.connect, as it does not depend on how the file was opened.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        The database connection.
+
+    Returns
+    -------
+    sqlite3.Connection
+        The same connection, for chaining.
+    """
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-64000")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
@@ -1,8 +1,9 @@
+import numpy as np
 import pandas as pd
 from programme_costing_utilities import calculations
 
 
-def run(data, conn):
+def run(data, conn, include_logs=True):
     """
     Go through components, unpack them into individual elements and create a transaction record for that element.
     For example, a meeting will have elements such as room hire, and per diems.
@@ -14,6 +15,9 @@ def run(data, conn):
         The input data.
     conn : sqlite3.Connection
         The database connection.
+    include_logs : bool, optional
+        Whether to format a log for each record, by default True.
+        Callers that only need the table can skip the formatting.
 
     Returns
     -------
@@ -28,8 +32,16 @@ def run(data, conn):
     desired_year = data["desired_year"]
     components = data["components"]
 
-    table = []
-    logs = []
+    # build the table column by column
+    years = []
+    component_types = []
+    headings = ([], [], [], [])
+    quantities = []
+    raw_costs = []
+    cost_currencies = []
+    cost_years = []
+    record_discounts = []
+    pending_logs = []
 
     FUNCTION_MAP = {
         "personnel": calculations.get_personnel_records,
@@ -37,9 +49,12 @@ def run(data, conn):
         "media": calculations.get_media_records
     }
 
+    # discount factors for every year, inclusive of end
+    discounts = calculations.calculate_discount(discount_rate, np.arange(start, end + 1), start)
+
     for i in range(start, end + 1):  # inclusive of end
 
-        discount = calculations.calculate_discount(discount_rate, i, start)
+        discount = discounts[i - start]
 
         for component_type, component_list in components.items():
             # collect records
@@ -47,37 +62,52 @@ def run(data, conn):
             for component in component_list:
                 records = func(component, conn, country, i, start)
             
-                # convert cost estimates to desired currency and year
+                # the costs are converted together once every record is in
                 for record in records:
                     year, log, resource_information, cost_information = record
                     cost, cost_currency, cost_year = cost_information
-                    updated_cost_information = calculations.rebase_currency(
-                        cost=cost,
-                        current_country=cost_currency,
-                        current_year=cost_year,
-                        desired_country=desired_currency, 
-                        desired_year=desired_year, 
-                        discount=discount,
-                        conn=conn)
 
-                    # Update log
-                    log = log.format(
-                        awaiting_cost=f"{updated_cost_information[0]:,.2f}",
-                        awaiting_currency=updated_cost_information[1], 
-                        awaiting_currency_year=updated_cost_information[2]
-                    )
-                    logs.append(log)
-                    row = {
-                        "year": year,
-                        "component": component_type,
-                        "heading_1": resource_information[0],
-                        "heading_2": resource_information[1],
-                        "heading_3": resource_information[2],
-                        "heading_4": resource_information[3],
-                        "quantity": round(resource_information[4], 2),
-                        "cost": round(updated_cost_information[0], 2)
-                    }
-                    table.append(row)
+                    raw_costs.append(cost)
+                    cost_currencies.append(cost_currency)
+                    cost_years.append(cost_year)
+                    record_discounts.append(discount)
+                    if include_logs:
+                        pending_logs.append(log)
+                    years.append(year)
+                    component_types.append(component_type)
+                    for heading, value in zip(headings, resource_information[:4]):
+                        heading.append(value)
+                    quantities.append(round(resource_information[4], 2))
+
+    # convert cost estimates to desired currency and year,
+    # looking up each distinct currency and year once
+    costs, rebased_currency, rebased_year = calculations.rebase_currency_records(
+        costs=raw_costs,
+        current_countries=cost_currencies,
+        current_years=cost_years,
+        desired_country=desired_currency,
+        desired_year=desired_year,
+        discounts=np.array(record_discounts, dtype=np.float64),
+        conn=conn)
+
+    # Update logs
+    logs = [
+        log.format(
+            awaiting_cost=f"{cost:,.2f}",
+            awaiting_currency=rebased_currency, 
+            awaiting_currency_year=rebased_year
+        )
+        for log, cost in zip(pending_logs, costs.tolist())
+    ]
 
-    table = pd.DataFrame(table)
-    return logs, table
\ No newline at end of file
+    table = pd.DataFrame({
+        "year": np.array(years, dtype=np.int64),
+        "component": component_types,
+        "heading_1": headings[0],
+        "heading_2": headings[1],
+        "heading_3": headings[2],
+        "heading_4": headings[3],
+        "quantity": np.array(quantities, dtype=np.float64),
+        "cost": [round(cost, 2) for cost in costs.tolist()]
+    })
+    return logs, table
@@ -0,0 +1,44 @@
+"""
+Provides the default programme inputs and component templates.
+"""
+import json
+from pathlib import Path
+
+TEMPLATES_DIRECTORY = Path(__file__).resolve().parent.parent / "templates"
+
+
+def load_template(name):
+    """
+    Load a component template from the templates directory.
+
+    Parameters
+    ----------
+    name : str
+        The name of the template, e.g. "personnel".
+
+    Returns
+    -------
+    list
+        The components in the template.
+    """
+    with open(TEMPLATES_DIRECTORY / f"{name}.json", "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+DEFAULT_PERSONNEL = load_template("personnel")
+DEFAULT_MEETINGS = load_template("meetings")
+DEFAULT_MEDIA = load_template("media")
+
+DEFAULTS = {
+    "country": "UGA",
+    "start_year": 2020,
+    "end_year": 2100,
+    "discount_rate": 1.03,
+    "desired_currency": "USD",
+    "desired_year": 2018,
+    "components": {
+        "personnel": DEFAULT_PERSONNEL,
+        "meetings": DEFAULT_MEETINGS,
+        "media": DEFAULT_MEDIA
+    }
+}
@@ -3,6 +3,7 @@ Test the fetching and calculating of cost data.
 """
 import unittest
 import sqlite3
+import numpy as np
 from programme_costing_utilities import calculations
 
 
@@ -13,6 +14,10 @@ class TestDemographics(unittest.TestCase):
         self.country = "VNM"
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_population_before_1950(self):
         """Test getting the population before 1950."""
         self.assertEqual(
@@ -31,6 +36,12 @@ class TestDemographics(unittest.TestCase):
         """Test getting the population between 1950 and 2100."""
         self.assertEqual(calculations.serve_population(self.country, 2020, self.conn), 96_648_685)
 
+    def test_precomputed_population(self):
+        """Test the precomputed population covers 1950 to 2100."""
+        population = calculations.precompute_population(self.country, self.conn)
+        self.assertEqual(len(population), 151)
+        self.assertEqual(population[2020 - 1950], 96_648_685)
+
 
 class TestStatisticalDivisions(unittest.TestCase):
     """Test getting statistical/administrative divisions."""
@@ -38,6 +49,10 @@ class TestStatisticalDivisions(unittest.TestCase):
         self.country = "CHN"
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_national_division(self):
         """Test getting the national division."""
         self.assertEqual(calculations.serve_number_of_divisions(self.country, "National", self.conn), 1)
@@ -64,6 +79,10 @@ class TestPersonnel(unittest.TestCase):
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
         self.standard_FTE = 1
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_cadre_1(self):
         """Test calculating the annual salary of a cadre."""
         self.assertEqual(
@@ -88,6 +107,12 @@ class TestPersonnel(unittest.TestCase):
             calculations.serve_personnel_annual_salary(self.country, 4, self.conn)[0], 18791.08
         )
 
+    def test_precomputed_salaries(self):
+        """Test the precomputed salaries are keyed by cadre."""
+        salaries = calculations.precompute_salaries(self.country, self.conn)
+        self.assertEqual(salaries[1][0], 6741.5)
+        self.assertEqual(salaries[4][0], 18791.08)
+
     def test_normalized_fte_national(self):
         """Test calculating the normalized FTE for national personnel."""
         self.assertEqual(
@@ -135,6 +160,10 @@ class TestConsumable(unittest.TestCase):
     def setUp(self):
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_paper(self):
         """Test getting the price of paper."""
         self.assertEqual(calculations.serve_supply_costs("Paper plain", self.conn)[0], 0.02171)
@@ -144,6 +173,13 @@ class TestConsumable(unittest.TestCase):
         item = "Multifunciton Photocopier, Fax, Printer and Scanner "
         self.assertEqual(calculations.serve_supply_costs(item, self.conn)[0], 2199)
 
+    def test_unknown_item(self):
+        """Test an item missing from the price list costs nothing."""
+        self.assertEqual(
+            calculations.serve_supply_costs("Not a supply", self.conn),
+            (0, (None, None))
+        )
+
 
 class TestPerDiem(unittest.TestCase):
     """
@@ -154,6 +190,10 @@ class TestPerDiem(unittest.TestCase):
         self.year = 2019
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_per_diem_int_national(self):
         """Test getting the per diem for an international."""
         actual_per_diem = calculations.serve_per_diem(
@@ -202,6 +242,10 @@ class TestDDist(unittest.TestCase):
     def setUp(self):
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_ddist95(self):
         """Test getting the DDist95 value"""
         country = "AUS"
@@ -233,6 +277,10 @@ class TestMeetings(unittest.TestCase):
         self.country = "ARG"
         self.year = 2019
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_national_workshop(self):
         attendees = [
             ("National Experts", "visiting", 4, True),
@@ -280,6 +328,10 @@ class TestCalculateVehicles(unittest.TestCase):
         self.car = "Corolla sedan 2014 model"
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_operating_cost_per_km(self):
         """Test getting the operating cost per km."""
         cost = calculations.serve_vehicle_operating_cost(self.car, self.conn)[0]
@@ -294,6 +346,58 @@ class TestCalculateVehicles(unittest.TestCase):
             consumption, 0.0668
         )
 
+    def test_vehicle_costs(self):
+        """Test getting the operating cost and fuel consumption together."""
+        operating_cost, consumption, currency_information = calculations.serve_vehicle_costs(
+            self.car,
+            self.conn
+        )
+        self.assertEqual(operating_cost, 0.13837172222222222)
+        self.assertEqual(consumption, 0.0668)
+        self.assertEqual(
+            currency_information,
+            calculations.serve_vehicle_operating_cost(self.car, self.conn)[1]
+        )
+
+    def test_unknown_vehicle(self):
+        """Test a vehicle missing from the price list costs nothing."""
+        self.assertEqual(
+            calculations.serve_vehicle_costs("Not a vehicle", self.conn),
+            (0, 0, (None, None))
+        )
+
+
+class TestHealthcareFacilities(unittest.TestCase):
+    """
+    Test getting the number of health facilities.
+    """
+    def setUp(self):
+        self.country = "UGA"
+        self.conn = sqlite3.connect('./data/who_choice_price_database.db')
+
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
+    def test_precomputed_facilities(self):
+        """Test the precomputed counts match querying each type on its own."""
+        facilities = calculations.precompute_healthcare_facilities(self.country, self.conn)
+        for label in calculations.HEALTHCARE_FACILITIES_COLUMNS:
+            query = calculations.HEALTHCARE_FACILITIES_QUERY.format(label=label)
+            expected = self.conn.execute(query, (self.country, )).fetchone()[0]
+            self.assertEqual(facilities[label], expected)
+            self.assertEqual(
+                calculations.serve_healthcare_facilities(self.country, label, self.conn),
+                expected
+            )
+
+    def test_unknown_country(self):
+        """Test a country missing from the table has no precomputed counts."""
+        self.assertEqual(
+            calculations.precompute_healthcare_facilities("XXX", self.conn),
+            {}
+        )
+
 class TestCalculateDiscount(unittest.TestCase):
     """
     Test the calculate_discount method.
@@ -322,6 +426,24 @@ class TestCalculateDiscount(unittest.TestCase):
 
         self.assertEqual(discount, 1 / 1.03**10)
 
+    def test_discount_array_of_years(self):
+        r = 1.03
+        years = np.arange(2020, 2031)
+        start = 2020
+        discounts = calculations.calculate_discount(r, years, start)
+
+        self.assertEqual(len(discounts), 11)
+        self.assertEqual(discounts[0], 1)
+        self.assertAlmostEqual(discounts[10], 1 / 1.03**10)
+
+    def test_discount_integer_rate(self):
+        """An integer rate over a long horizon shouldn't overflow."""
+        years = np.arange(2020, 2090)
+        discounts = calculations.calculate_discount(2, years, 2020)
+
+        self.assertTrue(np.all(np.isfinite(discounts)))
+        self.assertEqual(discounts[-1], 1 / 2**69)
+
 class TestRebaseCurrency(unittest.TestCase):
     """
     Tests the rebase currency function.
@@ -329,6 +451,10 @@ class TestRebaseCurrency(unittest.TestCase):
     def setUp(self):
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_no_rebase_needed(self):
         """
         Shouldn't need to do anything if both countries and years are the same.
@@ -572,4 +698,64 @@ class TestRebaseCurrency(unittest.TestCase):
         )
 
         self.assertAlmostEqual(cost_information[0], 10, 2)
-        ...
\ No newline at end of file
+        ...
+
+    def test_records(self):
+        """
+        Rebasing costs in different currencies should match rebasing each
+        cost on its own.
+        """
+        rebased_costs, currency, year = calculations.rebase_currency_records(
+            np.array([10.00, 10.00]),
+            ["GBR", "AUS"],
+            [2018, 2018],
+            "AUS",
+            2018,
+            1,
+            self.conn
+        )
+
+        self.assertAlmostEqual(rebased_costs[0], 21.38, 2)
+        self.assertAlmostEqual(rebased_costs[1], 10.00, 2)
+        self.assertEqual((currency, year), ("AUS", 2018))
+
+    def test_missing_currency(self):
+        """
+        A cost whose reference data is missing has no currency or year,
+        and should count as 0 rather than fail.
+        """
+        with self.assertWarns(UserWarning):
+            rebased_costs, currency, year = calculations.rebase_currency_records(
+                np.array([5.00, 10.00]),
+                [None, "AUS"],
+                [None, 2018],
+                "AUS",
+                2018,
+                1,
+                self.conn
+            )
+
+        self.assertEqual(rebased_costs[0], 0)
+        self.assertAlmostEqual(rebased_costs[1], 10.00, 2)
+        self.assertEqual((currency, year), ("AUS", 2018))
+
+    def test_missing_statistics(self):
+        """
+        A currency without World Bank data can't be rebased.
+        """
+        with self.assertRaises(ValueError):
+            calculations.rebase_currency(10.00, "XXX", 2018, "USD", 2018, 1, self.conn)
+
+
+class TestLogTemplate(unittest.TestCase):
+    """
+    Testing deferred record logs.
+    """
+    def test_format(self):
+        """A deferred log should format like the equivalent string."""
+        log = calculations.LogTemplate(
+            "{year}: {cost:,.2f} -> {awaiting_cost}",
+            year=2020,
+            cost=1234.5
+        )
+        self.assertEqual(log.format(awaiting_cost="1.00"), "2020: 1,234.50 -> 1.00")
@@ -3,8 +3,9 @@ Test the main module and runtime.
 """
 import unittest
 import sqlite3
+import pandas as pd
 import main
-from programme_costing_utilities import runtime
+from programme_costing_utilities import calculations, runtime
 
 class TestRuntime(unittest.TestCase):
     """Set-up main and run"""
@@ -12,6 +13,17 @@ class TestRuntime(unittest.TestCase):
         self.data = main.DEFAULTS
         self.conn = sqlite3.connect('./data/who_choice_price_database.db')
 
+    def tearDown(self):
+        self.conn.close()
+        calculations.clear_reference_caches()
+
     def test_runtime(self):
         records = runtime.run(self.data, self.conn)
-        ...
\ No newline at end of file
+        ...
+
+    def test_runtime_without_logs(self):
+        """Skipping the logs should return no logs and the same table."""
+        _, table = runtime.run(self.data, self.conn)
+        logs, table_without_logs = runtime.run(self.data, self.conn, include_logs=False)
+        self.assertEqual(logs, [])
+        pd.testing.assert_frame_equal(table_without_logs, table)